@@ -1,4 +1,5 @@
 """Azure Document Intelligence client management."""
+import asyncio
 from typing import Optional
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
@@ -7,6 +8,10 @@ from fastapi import HTTPException
 
 from app.config import config
 
+# Shared async client, reused across documents so connections stay pooled
+_async_client: Optional[AsyncDocumentIntelligenceClient] = None
+_async_client_lock = asyncio.Lock()
+
 
 class AzureClientFactory:
     """Factory for creating Azure Document Intelligence clients."""
@@ -36,9 +41,12 @@ class AzureClientFactory:
         )
     
     @staticmethod
-    def create_async_client() -> AsyncDocumentIntelligenceClient:
+    async def create_async_client() -> AsyncDocumentIntelligenceClient:
         """
-        Create and return an asynchronous Azure Document Intelligence client.
+        Return the shared asynchronous Azure Document Intelligence client.
+        
+        The client is created on first use and cached for the lifetime of the
+        application; call close_async_client() on shutdown to release it.
         
         Returns:
             AsyncDocumentIntelligenceClient: Configured async client instance
@@ -46,16 +54,34 @@ class AzureClientFactory:
         Raises:
             HTTPException: If Azure credentials are not configured
         """
-        is_valid, error_message = config.validate_azure_credentials()
-        if not is_valid:
-            raise HTTPException(
-                status_code=500,
-                detail=error_message
-            )
+        global _async_client
         
-        credential = AzureKeyCredential(config.azure_key)
-        return AsyncDocumentIntelligenceClient(
-            endpoint=config.azure_endpoint,
-            credential=credential
-        )
-
+        if _async_client is not None:
+            return _async_client
+        
+        async with _async_client_lock:
+            if _async_client is None:
+                is_valid, error_message = config.validate_azure_credentials()
+                if not is_valid:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=error_message
+                    )
+                
+                credential = AzureKeyCredential(config.azure_key)
+                _async_client = AsyncDocumentIntelligenceClient(
+                    endpoint=config.azure_endpoint,
+                    credential=credential
+                )
+        
+        return _async_client
+    
+    @staticmethod
+    async def close_async_client() -> None:
+        """Close the shared asynchronous client if it has been created."""
+        global _async_client
+        
+        async with _async_client_lock:
+            if _async_client is not None:
+                await _async_client.close()
+                _async_client = None
@@ -8,48 +8,92 @@ from app.constants import (
     ENV_ENDPOINT,
     ENV_KEY,
     ENV_MODEL_ID,
+    ENV_MAX_CONCURRENT_AZURE_CALLS,
+    ENV_DEBUG,
     DEFAULT_MODEL_ID,
     DEFAULT_HOST,
-    DEFAULT_PORT
+    DEFAULT_PORT,
+    DEFAULT_MAX_CONCURRENT_AZURE_CALLS
 )
 
+# Whether the .env file has already been loaded into the environment
+_loaded = False
+
+
+def _load_env_file() -> None:
+    """Load the .env file into the environment once per process."""
+    global _loaded
+    if _loaded:
+        return
+    
+    # Load .env file if it exists
+    env_path = Path(__file__).parent.parent / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+    else:
+        load_dotenv()
+    _loaded = True
+
 
 class Config:
     """Application configuration."""
     
     def __init__(self) -> None:
         """Initialize configuration by loading environment variables."""
-        # Load .env file if it exists
-        env_path = Path(__file__).parent.parent / ".env"
-        if env_path.exists():
-            load_dotenv(env_path)
-        else:
-            load_dotenv()
+        _load_env_file()
+        self._read_environment()
+    
+    def _read_environment(self) -> None:
+        """Read environment variables once and cache the values."""
+        self._azure_endpoint: Optional[str] = os.getenv(ENV_ENDPOINT)
+        self._azure_key: Optional[str] = os.getenv(ENV_KEY)
+        self._azure_model_id: str = os.getenv(ENV_MODEL_ID, DEFAULT_MODEL_ID)
+        self._host: str = os.getenv("HOST", DEFAULT_HOST)
+        self._port: int = int(os.getenv("PORT", DEFAULT_PORT))
+        self._max_concurrent_azure_calls: int = max(
+            1,
+            int(os.getenv(ENV_MAX_CONCURRENT_AZURE_CALLS, DEFAULT_MAX_CONCURRENT_AZURE_CALLS))
+        )
+        self._debug: bool = os.getenv(ENV_DEBUG, "").lower() in ("1", "true", "yes")
+    
+    def clear_cache(self) -> None:
+        """Re-read environment variables, discarding cached values."""
+        self._read_environment()
     
     @property
     def azure_endpoint(self) -> Optional[str]:
         """Get Azure Document Intelligence endpoint."""
-        return os.getenv(ENV_ENDPOINT)
+        return self._azure_endpoint
     
     @property
     def azure_key(self) -> Optional[str]:
         """Get Azure Document Intelligence API key."""
-        return os.getenv(ENV_KEY)
+        return self._azure_key
     
     @property
     def azure_model_id(self) -> str:
         """Get Azure Document Intelligence model ID."""
-        return os.getenv(ENV_MODEL_ID, DEFAULT_MODEL_ID)
+        return self._azure_model_id
     
     @property
     def host(self) -> str:
         """Get server host."""
-        return os.getenv("HOST", DEFAULT_HOST)
+        return self._host
     
     @property
     def port(self) -> int:
         """Get server port."""
-        return int(os.getenv("PORT", DEFAULT_PORT))
+        return self._port
+    
+    @property
+    def max_concurrent_azure_calls(self) -> int:
+        """Get maximum number of concurrent Azure analyze calls across all jobs in the process."""
+        return self._max_concurrent_azure_calls
+    
+    @property
+    def debug(self) -> bool:
+        """Get whether development mode is enabled."""
+        return self._debug
     
     def validate_azure_credentials(self) -> Tuple[bool, Optional[str]]:
         """
@@ -1,8 +1,8 @@
 """Constants for the Document Intelligence application."""
-from typing import List
+from typing import Tuple
 
 # Expected field names
-EXPECTED_FIELDS: List[str] = [
+EXPECTED_FIELDS: Tuple[str, ...] = (
     "SupplyAddress1",
     "SupplyAddress2",
     "ConsumptionPeriod",
@@ -10,21 +10,43 @@ EXPECTED_FIELDS: List[str] = [
     "FixedEnergyPriceRate",
     "TotalPayWithAllCharges",
     "TotalEnergyCharge"
-]
+)
 
 # Environment variable names
 ENV_ENDPOINT = "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT"
 ENV_KEY = "AZURE_DOCUMENT_INTELLIGENCE_KEY"
 ENV_MODEL_ID = "AZURE_DOCUMENT_MODEL_ID"
+ENV_MAX_CONCURRENT_AZURE_CALLS = "MAX_CONCURRENT_AZURE_CALLS"
+ENV_DEBUG = "DEBUG"
 
 # Default values
 DEFAULT_MODEL_ID = "prebuilt-layout"
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 8000
+DEFAULT_MAX_CONCURRENT_AZURE_CALLS = 8
 
 # File validation
 ALLOWED_FILE_EXTENSIONS = {".pdf"}
 CONTENT_TYPE_PDF = "application/pdf"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Larger uploads spill to disk
+
+# Maximum number of jobs kept in memory; the oldest are evicted first
+MAX_TRACKED_JOBS = 10_000
+
+# Completed jobs are purged after this many seconds, checked periodically
+COMPLETED_JOB_TTL_SECONDS = 60 * 60
+JOB_CLEANUP_INTERVAL_SECONDS = 5 * 60
+
+# Extracted fields cached by document content; the least recently used go first
+RESULT_CACHE_SIZE = 64
+RESULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Seconds between keep-alive comments on idle status event streams
+SSE_KEEPALIVE_SECONDS = 15
+
+# Responses smaller than this many bytes are sent uncompressed
+GZIP_MINIMUM_SIZE = 1024
 
 # Job status values
 STATUS_PENDING = "pending"
@@ -32,14 +54,18 @@ STATUS_PROCESSING = "processing"
 STATUS_COMPLETED = "completed"
 STATUS_ERROR = "error"
 
+# Server-sent job status event types
+EVENT_SNAPSHOT = "snapshot"
+EVENT_FILE = "file"
+EVENT_COMPLETED = "completed"
+
 # File processing messages
 MESSAGE_QUEUED = "Queued for processing"
 MESSAGE_UPLOADING = "Uploading to Azure..."
-MESSAGE_SENDING = "Sending to Azure..."
-MESSAGE_CALLING_API = "Calling Azure API..."
 MESSAGE_WAITING = "Waiting for Azure response..."
 MESSAGE_EXTRACTING = "Extracting fields..."
 MESSAGE_COMPLETED = "Completed successfully"
+MESSAGE_COMPLETED_CACHED = "Completed (cached result)"
 
 # Field value placeholders
 NOT_FOUND = "(not found)"
@@ -1,7 +1,8 @@
 """Document processing service."""
+import asyncio
 import logging
-from io import BytesIO
-from typing import List, Tuple
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
 
 from azure.ai.documentintelligence.models import DocumentAnalysisFeature
 
@@ -9,116 +10,220 @@ from app.azure_client import AzureClientFactory
 from app.config import config
 from app.field_extractor import FieldExtractor
 from app.job_manager import job_manager
-from app.models import FileProcessingResult
+from app.models import FileProcessingResult, FileStatus, JobStatus
+from app.result_cache import result_cache
 from app.constants import (
     STATUS_PROCESSING,
     STATUS_COMPLETED,
     STATUS_ERROR,
     CONTENT_TYPE_PDF,
     MESSAGE_UPLOADING,
-    MESSAGE_SENDING,
-    MESSAGE_CALLING_API,
     MESSAGE_WAITING,
     MESSAGE_EXTRACTING,
     MESSAGE_COMPLETED,
+    MESSAGE_COMPLETED_CACHED,
     EXPECTED_FIELDS
 )
 
 logger = logging.getLogger(__name__)
 
+# Analysis options for prebuilt models, built once at import time
+_PREBUILT_FEATURES = (
+    DocumentAnalysisFeature.KEY_VALUE_PAIRS,
+    DocumentAnalysisFeature.QUERY_FIELDS
+)
+
+# Limits Azure calls in flight across all jobs, so concurrent requests queue
+# here instead of running into Azure throttling
+_AZURE_CALL_LIMIT = config.max_concurrent_azure_calls
+_azure_semaphore = asyncio.Semaphore(_AZURE_CALL_LIMIT)
+_azure_calls_waiting = 0
+_azure_calls_in_flight = 0
+
+
+@asynccontextmanager
+async def _azure_call_slot() -> AsyncIterator[None]:
+    """Hold one of the shared Azure call slots, counting waiting and active calls."""
+    global _azure_calls_waiting, _azure_calls_in_flight
+    
+    _azure_calls_waiting += 1
+    try:
+        await _azure_semaphore.acquire()
+    finally:
+        _azure_calls_waiting -= 1
+    
+    _azure_calls_in_flight += 1
+    try:
+        yield
+    finally:
+        _azure_calls_in_flight -= 1
+        _azure_semaphore.release()
+
 
 class DocumentProcessor:
     """Service for processing documents with Azure Document Intelligence."""
     
+    @staticmethod
+    def _set_file_status(
+        job: JobStatus,
+        file_index: int,
+        file_slot: FileStatus,
+        status: str,
+        message: str,
+        result: Optional[FileProcessingResult] = None
+    ) -> None:
+        """
+        Update a file's status in place, bump the job version and notify subscribers.
+        
+        Each file slot is only written by the task processing that file.
+        
+        Args:
+            job: Job the file belongs to
+            file_index: Index of file in job
+            file_slot: FileStatus entry of the file in its job
+            status: New status
+            message: Status message
+            result: Optional processing result
+        """
+        file_slot.status = status
+        file_slot.message = message
+        if result:
+            file_slot.result = result
+        job.version += 1
+        job_manager.publish_file_status(job, file_index)
+    
+    @staticmethod
+    def get_azure_call_stats() -> Dict[str, int]:
+        """
+        Get the current usage of the shared Azure call limit.
+        
+        Returns:
+            Dictionary with the limit and the number of in-flight and waiting calls
+        """
+        return {
+            "limit": _AZURE_CALL_LIMIT,
+            "in_flight": _azure_calls_in_flight,
+            "waiting": _azure_calls_waiting
+        }
+    
+    @staticmethod
+    def build_analyze_options(model_id: str) -> Dict[str, Any]:
+        """
+        Build the begin_analyze_document arguments for a model.
+        
+        Prebuilt models also get key-value pairs and the expected fields as
+        query fields.
+        
+        Args:
+            model_id: Azure Document Intelligence model ID
+            
+        Returns:
+            Keyword arguments for begin_analyze_document, except the body
+        """
+        analyze_options: Dict[str, Any] = {
+            "model_id": model_id,
+            "content_type": CONTENT_TYPE_PDF
+        }
+        if model_id.startswith("prebuilt-"):
+            analyze_options["features"] = _PREBUILT_FEATURES
+            analyze_options["query_fields"] = EXPECTED_FIELDS
+        return analyze_options
+    
     @staticmethod
     async def process_document(
-        file_content: bytes,
+        file_stream: BinaryIO,
         filename: str,
         job_id: str,
-        file_index: int
+        file_index: int,
+        analyze_options: Dict[str, Any]
     ) -> None:
         """
         Process a single document and update job status.
         
         Args:
-            file_content: Binary content of the PDF file
+            file_stream: Readable PDF stream; it is closed once processed
             filename: Name of the file
             job_id: Job identifier
             file_index: Index of file in job
+            analyze_options: Arguments from build_analyze_options()
         """
-        client = None
+        job = job_manager.get_job(job_id)
+        file_slot = job_manager.get_file_slot(job_id, file_index)
+        if job is None or file_slot is None:
+            logger.warning("Skipping file %s: job %s has no slot %d", filename, job_id, file_index)
+            file_stream.close()
+            return
+        
         try:
-            # Update status: Starting
-            job_manager.update_file_status(
-                job_id=job_id,
-                file_index=file_index,
-                status=STATUS_PROCESSING,
-                message=MESSAGE_UPLOADING
-            )
-            
-            # Get async client
-            client = AzureClientFactory.create_async_client()
-            
-            # Convert file content to BytesIO
-            file_stream = BytesIO(file_content)
-            file_stream.seek(0)
-            
-            # Update status: Analyzing
-            job_manager.update_file_status(
-                job_id=job_id,
-                file_index=file_index,
-                status=STATUS_PROCESSING,
-                message=MESSAGE_SENDING
-            )
-            
-            # Update status: Calling API
-            job_manager.update_file_status(
-                job_id=job_id,
-                file_index=file_index,
-                status=STATUS_PROCESSING,
-                message=MESSAGE_CALLING_API
+            # Reuse the fields of an identical document analyzed earlier
+            cache_key = await asyncio.to_thread(
+                result_cache.compute_key,
+                file_stream,
+                analyze_options["model_id"]
             )
+            cached_fields = result_cache.get(cache_key)
+            if cached_fields is not None:
+                DocumentProcessor._set_file_status(
+                    job=job,
+                    file_index=file_index,
+                    file_slot=file_slot,
+                    status=STATUS_COMPLETED,
+                    message=MESSAGE_COMPLETED_CACHED,
+                    result=FileProcessingResult(
+                        filename=filename,
+                        status="success",
+                        fields=cached_fields
+                    )
+                )
+                logger.info("Used cached result for file %s in job %s", filename, job_id)
+                return
             
-            # Call Azure API
-            model_id = config.azure_model_id
+            # Get shared async client
+            client = await AzureClientFactory.create_async_client()
             
-            if model_id.startswith("prebuilt-"):
-                poller = await client.begin_analyze_document(
-                    model_id=model_id,
-                    body=file_stream,
-                    content_type=CONTENT_TYPE_PDF,
-                    features=[
-                        DocumentAnalysisFeature.KEY_VALUE_PAIRS,
-                        DocumentAnalysisFeature.QUERY_FIELDS
-                    ],
-                    query_fields=EXPECTED_FIELDS
+            # Wait for a free Azure slot; the file stays queued until then
+            async with _azure_call_slot():
+                # Update status: Starting
+                DocumentProcessor._set_file_status(
+                    job=job,
+                    file_index=file_index,
+                    file_slot=file_slot,
+                    status=STATUS_PROCESSING,
+                    message=MESSAGE_UPLOADING
                 )
-            else:
+                
+                # Call Azure API, streaming the file as the request body
                 poller = await client.begin_analyze_document(
-                    model_id=model_id,
                     body=file_stream,
-                    content_type=CONTENT_TYPE_PDF
+                    **analyze_options
                 )
-            
-            # Poll for results
-            job_manager.update_file_status(
-                job_id=job_id,
-                file_index=file_index,
-                status=STATUS_PROCESSING,
-                message=MESSAGE_WAITING
-            )
-            
-            analyze_result = await poller.result()
+                
+                # The document has been sent; release its buffer while waiting
+                file_stream.close()
+                
+                # Poll for results
+                DocumentProcessor._set_file_status(
+                    job=job,
+                    file_index=file_index,
+                    file_slot=file_slot,
+                    status=STATUS_PROCESSING,
+                    message=MESSAGE_WAITING
+                )
+                
+                analyze_result = await poller.result()
             
             # Extract fields
-            job_manager.update_file_status(
-                job_id=job_id,
+            DocumentProcessor._set_file_status(
+                job=job,
                 file_index=file_index,
+                file_slot=file_slot,
                 status=STATUS_PROCESSING,
                 message=MESSAGE_EXTRACTING
             )
             
-            fields = FieldExtractor.extract_fields(analyze_result)
+            # Walking the result is CPU-bound; keep it off the event loop
+            fields = await asyncio.to_thread(FieldExtractor.extract_fields, analyze_result)
+            result_cache.put(cache_key, fields)
             
             # Create result
             result = FileProcessingResult(
@@ -128,18 +233,19 @@ class DocumentProcessor:
             )
             
             # Update status: Complete
-            job_manager.update_file_status(
-                job_id=job_id,
+            DocumentProcessor._set_file_status(
+                job=job,
                 file_index=file_index,
+                file_slot=file_slot,
                 status=STATUS_COMPLETED,
                 message=MESSAGE_COMPLETED,
                 result=result
             )
             
-            logger.info(f"Successfully processed file {filename} in job {job_id}")
+            logger.info("Successfully processed file %s in job %s", filename, job_id)
             
         except Exception as e:
-            logger.error(f"Error processing file {filename}: {str(e)}", exc_info=True)
+            logger.error("Error processing file %s: %s", filename, e, exc_info=True)
             
             # Create error result
             result = FileProcessingResult(
@@ -149,47 +255,63 @@ class DocumentProcessor:
             )
             
             # Update status: Error
-            job_manager.update_file_status(
-                job_id=job_id,
+            DocumentProcessor._set_file_status(
+                job=job,
                 file_index=file_index,
+                file_slot=file_slot,
                 status=STATUS_ERROR,
                 message=str(e),
                 result=result
             )
         
         finally:
-            # Close async client
-            if client:
-                await client.close()
+            file_stream.close()
     
     @staticmethod
     async def process_documents(
-        files_content: List[Tuple[bytes, str]],
+        files_content: List[Tuple[BinaryIO, str]],
         job_id: str
     ) -> None:
         """
         Process all documents asynchronously.
         
+        Files are processed concurrently; the module-level semaphore keeps
+        the number of Azure calls in flight across all jobs at
+        config.max_concurrent_azure_calls, as read at import time.
+        
         Args:
-            files_content: List of tuples (content, filename)
+            files_content: List of tuples (file stream, filename)
             job_id: Job identifier
         """
-        import asyncio
+        # Resolve the model-specific analyze arguments once for the whole job
+        analyze_options = DocumentProcessor.build_analyze_options(config.azure_model_id)
         
-        tasks = [
-            DocumentProcessor.process_document(
-                file_content=content,
+        if len(files_content) == 1:
+            # A single file needs no task scheduling
+            file_stream, filename = files_content[0]
+            await DocumentProcessor.process_document(
+                file_stream=file_stream,
                 filename=filename,
                 job_id=job_id,
-                file_index=index
+                file_index=0,
+                analyze_options=analyze_options
             )
-            for index, (content, filename) in enumerate(files_content)
-        ]
-        
-        # Process all files concurrently
-        await asyncio.gather(*tasks, return_exceptions=True)
+        else:
+            tasks = [
+                DocumentProcessor.process_document(
+                    file_stream=file_stream,
+                    filename=filename,
+                    job_id=job_id,
+                    file_index=index,
+                    analyze_options=analyze_options
+                )
+                for index, (file_stream, filename) in enumerate(files_content)
+            ]
+            
+            # Process files concurrently
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         # Mark job as complete
         job_manager.complete_job(job_id)
-        logger.info(f"Completed processing job {job_id}")
+        logger.info("Completed processing job %s", job_id)
 
@@ -1,12 +1,81 @@
 """Document field extraction utilities."""
 import logging
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from app.constants import EXPECTED_FIELDS, NOT_FOUND, EMPTY
+from azure.ai.documentintelligence.models import DocumentField
+
+from app.constants import (
+    EXPECTED_FIELDS,
+    NOT_FOUND,
+    EMPTY
+)
 from app.models import FieldData
 
 logger = logging.getLogger(__name__)
 
+# Characters ignored when comparing field names
+_NORMALIZE_TABLE = str.maketrans("", "", " _-")
+
+# Expected field names keyed by their normalized form
+_NORMALIZED_EXPECTED_FIELDS: Dict[str, str] = {
+    field_name.translate(_NORMALIZE_TABLE).lower(): field_name
+    for field_name in EXPECTED_FIELDS
+}
+
+# Attribute naming style of the installed SDK's DocumentField model.
+# Older SDKs exposed camelCase names, current ones use snake_case.
+_SNAKE_CASE = 'value_string' in dir(DocumentField)
+_CURRENCY_SYMBOL_ATTR = 'currency_symbol' if _SNAKE_CASE else 'currencySymbol'
+
+# Shared placeholders for expected fields missing from a document
+_NOT_FOUND_FIELDS: Dict[str, FieldData] = {
+    field_name: FieldData(field_name=field_name, field_value=NOT_FOUND, confidence=None)
+    for field_name in EXPECTED_FIELDS
+}
+
+
+def _element_text(element: Any) -> str:
+    """Get the stripped text of a key-value pair element, or "" if missing."""
+    if not element:
+        return ""
+    text = getattr(element, 'content', None)
+    if text is None:
+        text = getattr(element, 'text', None)
+    return str(text).strip() if text is not None else ""
+
+
+def _format_text(value: Any) -> str:
+    """Format a text value."""
+    return str(value).strip()
+
+
+def _format_currency(currency: Any) -> str:
+    """Format a currency value as symbol followed by amount."""
+    amount = getattr(currency, 'amount', None)
+    symbol = getattr(currency, _CURRENCY_SYMBOL_ATTR, None)
+    if amount is not None and symbol is not None:
+        return f"{symbol}{amount}"
+    return str(currency)
+
+
+def _format_address(address: Any) -> str:
+    """Format an address value, preferring its formatted representation."""
+    return getattr(address, 'formatted', None) or str(address)
+
+
+# Value attributes in priority order, paired with their formatter
+_VALUE_ATTRS: Tuple[Tuple[str, Callable[[Any], str]], ...] = (
+    # Priority 1: 'content' (most reliable)
+    ('content', _format_text),
+    # Priority 2: string values
+    ('value_string' if _SNAKE_CASE else 'valueString', _format_text),
+    # Priority 3: other value types
+    ('value_number' if _SNAKE_CASE else 'valueNumber', str),
+    ('value_date' if _SNAKE_CASE else 'valueDate', str),
+    ('value_currency' if _SNAKE_CASE else 'valueCurrency', _format_currency),
+    ('value_address' if _SNAKE_CASE else 'valueAddress', _format_address),
+)
+
 
 class FieldExtractor:
     """Extracts fields from Azure Document Intelligence results."""
@@ -22,25 +91,21 @@ class FieldExtractor:
         Returns:
             Normalized field name
         """
-        return field_name.replace(" ", "").replace("_", "").replace("-", "").lower()
+        return field_name.translate(_NORMALIZE_TABLE).lower()
     
     @staticmethod
-    def match_expected_field(normalized_field: str, expected_fields: Set[str]) -> Optional[str]:
+    def match_expected_field(normalized_field: str, expected_fields: Dict[str, str]) -> Optional[str]:
         """
         Match normalized field name with expected fields.
         
         Args:
             normalized_field: Normalized field name to match
-            expected_fields: Set of expected field names
+            expected_fields: Mapping of normalized to original expected field names
             
         Returns:
             Matched expected field name or None
         """
-        for expected_field in expected_fields:
-            normalized_expected = FieldExtractor.normalize_field_name(expected_field)
-            if normalized_field == normalized_expected:
-                return expected_field
-        return None
+        return expected_fields.get(normalized_field)
     
     @staticmethod
     def extract_field_data(field_name: str, field_value: Any) -> Optional[FieldData]:
@@ -58,42 +123,18 @@ class FieldExtractor:
         field_value_str = None
         
         # Get confidence if available
-        if hasattr(field_value, 'confidence') and field_value.confidence is not None:
-            confidence = round(field_value.confidence * 100, 2)
-        
-        # Priority 1: Try 'content' first (most reliable)
-        if hasattr(field_value, 'content') and field_value.content:
-            field_value_str = str(field_value.content).strip()
+        raw_confidence = getattr(field_value, 'confidence', None)
+        if raw_confidence is not None:
+            confidence = round(raw_confidence * 100, 2)
         
-        # Priority 2: Try valueString (camelCase) or value_string (snake_case)
-        elif hasattr(field_value, 'valueString') and field_value.valueString:
-            field_value_str = str(field_value.valueString).strip()
-        elif hasattr(field_value, 'value_string') and field_value.value_string:
-            field_value_str = str(field_value.value_string).strip()
-        
-        # Priority 3: Try other value types
-        elif hasattr(field_value, 'valueNumber') and field_value.valueNumber is not None:
-            field_value_str = str(field_value.valueNumber)
-        elif hasattr(field_value, 'value_number') and field_value.value_number is not None:
-            field_value_str = str(field_value.value_number)
-        elif hasattr(field_value, 'valueDate') and field_value.valueDate:
-            field_value_str = str(field_value.valueDate)
-        elif hasattr(field_value, 'value_date') and field_value.value_date:
-            field_value_str = str(field_value.value_date)
-        elif hasattr(field_value, 'valueCurrency') and field_value.valueCurrency:
-            currency = field_value.valueCurrency
-            if hasattr(currency, 'amount') and hasattr(currency, 'currencySymbol'):
-                field_value_str = f"{currency.currencySymbol}{currency.amount}"
-            elif hasattr(currency, 'amount') and hasattr(currency, 'currency_symbol'):
-                field_value_str = f"{currency.currency_symbol}{currency.amount}"
-            else:
-                field_value_str = str(currency)
-        elif hasattr(field_value, 'valueAddress') and field_value.valueAddress:
-            address = field_value.valueAddress
-            if hasattr(address, 'formatted'):
-                field_value_str = address.formatted
-            else:
-                field_value_str = str(address)
+        # Probe value attributes in priority order, first usable value wins
+        for attr_name, formatter in _VALUE_ATTRS:
+            value = getattr(field_value, attr_name, None)
+            if value is None:
+                continue
+            field_value_str = formatter(value)
+            if field_value_str:
+                break
         
         if field_value_str:
             return FieldData(
@@ -106,30 +147,28 @@ class FieldExtractor:
     @staticmethod
     def extract_from_structured_documents(
         analyze_result: Any,
-        expected_fields: Set[str],
-        found_fields: Set[str]
-    ) -> List[FieldData]:
+        expected_fields: Dict[str, str],
+        fields: Dict[str, Optional[FieldData]]
+    ) -> None:
         """
         Extract fields from structured documents (invoices, receipts, etc.).
         
         Args:
             analyze_result: Result from Azure Document Intelligence
-            expected_fields: Set of expected field names
-            found_fields: Set to track found fields
-            
-        Returns:
-            List of extracted FieldData objects
+            expected_fields: Mapping of normalized to original expected field names
+            fields: Fields found so far keyed by name; new fields are added,
+                already found ones are kept
         """
-        fields = []
-        
-        if not (hasattr(analyze_result, 'documents') and analyze_result.documents):
-            return fields
+        documents = getattr(analyze_result, 'documents', None)
+        if not documents:
+            return
         
-        for document in analyze_result.documents:
-            if not (hasattr(document, 'fields') and document.fields):
+        for document in documents:
+            document_fields = getattr(document, 'fields', None)
+            if not document_fields:
                 continue
             
-            for field_name, field_value in document.fields.items():
+            for field_name, field_value in document_fields.items():
                 normalized_field_name = FieldExtractor.normalize_field_name(field_name)
                 matched_field = FieldExtractor.match_expected_field(
                     normalized_field_name,
@@ -137,57 +176,42 @@ class FieldExtractor:
                 )
                 
                 field_name_to_use = matched_field if matched_field else field_name
-                field_data = FieldExtractor.extract_field_data(field_name_to_use, field_value)
+                if fields.get(field_name_to_use) is not None:
+                    continue
                 
+                field_data = FieldExtractor.extract_field_data(field_name_to_use, field_value)
                 if field_data:
-                    fields.append(field_data)
-                    found_fields.add(field_name_to_use)
-        
-        return fields
+                    fields[field_name_to_use] = field_data
     
     @staticmethod
     def extract_from_key_value_pairs(
         analyze_result: Any,
-        expected_fields: Set[str],
-        found_fields: Set[str]
-    ) -> List[FieldData]:
+        expected_fields: Dict[str, str],
+        fields: Dict[str, Optional[FieldData]]
+    ) -> None:
         """
         Extract fields from key-value pairs.
         
         Args:
             analyze_result: Result from Azure Document Intelligence
-            expected_fields: Set of expected field names
-            found_fields: Set to track found fields
-            
-        Returns:
-            List of extracted FieldData objects
+            expected_fields: Mapping of normalized to original expected field names
+            fields: Fields found so far keyed by name; new fields are added,
+                already found ones are kept
         """
-        fields = []
-        
-        if not (hasattr(analyze_result, 'key_value_pairs') and analyze_result.key_value_pairs):
-            return fields
+        key_value_pairs = getattr(analyze_result, 'key_value_pairs', None)
+        if not key_value_pairs:
+            return
         
-        for kv_pair in analyze_result.key_value_pairs:
-            # Get key content
-            key_content = ""
-            if hasattr(kv_pair, 'key') and kv_pair.key:
-                if hasattr(kv_pair.key, 'content'):
-                    key_content = str(kv_pair.key.content).strip()
-                elif hasattr(kv_pair.key, 'text'):
-                    key_content = str(kv_pair.key.text).strip()
-            
-            # Get value content
-            value_content = ""
-            if hasattr(kv_pair, 'value') and kv_pair.value:
-                if hasattr(kv_pair.value, 'content'):
-                    value_content = str(kv_pair.value.content).strip()
-                elif hasattr(kv_pair.value, 'text'):
-                    value_content = str(kv_pair.value.text).strip()
+        for kv_pair in key_value_pairs:
+            # Get key and value content
+            key_content = _element_text(getattr(kv_pair, 'key', None))
+            value_content = _element_text(getattr(kv_pair, 'value', None))
             
             # Get confidence
             confidence = None
-            if hasattr(kv_pair, 'confidence') and kv_pair.confidence is not None:
-                confidence = round(kv_pair.confidence * 100, 2)
+            raw_confidence = getattr(kv_pair, 'confidence', None)
+            if raw_confidence is not None:
+                confidence = round(raw_confidence * 100, 2)
             
             # Match with expected fields
             normalized_key = FieldExtractor.normalize_field_name(key_content)
@@ -196,15 +220,12 @@ class FieldExtractor:
             field_name_to_use = matched_field if matched_field else key_content
             
             # Add if not already found
-            if key_content and field_name_to_use not in found_fields:
-                fields.append(FieldData(
+            if key_content and fields.get(field_name_to_use) is None:
+                fields[field_name_to_use] = FieldData(
                     field_name=field_name_to_use,
                     field_value=value_content if value_content else EMPTY,
                     confidence=confidence
-                ))
-                found_fields.add(field_name_to_use)
-        
-        return fields
+                )
     
     @staticmethod
     def extract_fields(analyze_result: Any) -> List[FieldData]:
@@ -217,44 +238,26 @@ class FieldExtractor:
         Returns:
             List of FieldData objects containing field information
         """
-        expected_fields_set = set(EXPECTED_FIELDS)
-        found_fields: Set[str] = set()
-        fields: List[FieldData] = []
+        # Expected fields come first in their listed order, followed by any
+        # other fields in the order they were found
+        fields: Dict[str, Optional[FieldData]] = dict.fromkeys(EXPECTED_FIELDS)
         
         # Extract from structured documents first
-        fields.extend(
-            FieldExtractor.extract_from_structured_documents(
-                analyze_result,
-                expected_fields_set,
-                found_fields
-            )
+        FieldExtractor.extract_from_structured_documents(
+            analyze_result,
+            _NORMALIZED_EXPECTED_FIELDS,
+            fields
         )
         
         # Extract from key-value pairs
-        fields.extend(
-            FieldExtractor.extract_from_key_value_pairs(
-                analyze_result,
-                expected_fields_set,
-                found_fields
-            )
+        FieldExtractor.extract_from_key_value_pairs(
+            analyze_result,
+            _NORMALIZED_EXPECTED_FIELDS,
+            fields
         )
         
-        # Ensure all expected fields are present (even if empty)
-        for expected_field in expected_fields_set:
-            if expected_field not in found_fields:
-                fields.append(FieldData(
-                    field_name=expected_field,
-                    field_value=NOT_FOUND,
-                    confidence=None
-                ))
-        
-        # Sort fields: expected fields first, then others
-        def sort_key(field: FieldData) -> tuple[int, int]:
-            if field.field_name in expected_fields_set:
-                return (0, EXPECTED_FIELDS.index(field.field_name))
-            return (1, 0)
-        
-        fields.sort(key=sort_key)
-        
-        return fields
-
+        # Expected fields that were not found get a placeholder
+        return [
+            field_data if field_data is not None else _NOT_FOUND_FIELDS[field_name]
+            for field_name, field_data in fields.items()
+        ]
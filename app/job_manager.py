@@ -1,11 +1,23 @@
 """Job status management."""
+import asyncio
 import logging
-from typing import Dict, Optional
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from uuid import uuid4
 
-from app.models import JobStatus, FileStatus, FileProcessingResult
-from app.constants import STATUS_PENDING, STATUS_PROCESSING, STATUS_COMPLETED, STATUS_ERROR, MESSAGE_QUEUED
+from app.models import JobStatus, FileStatus
+from app.constants import (
+    STATUS_PENDING,
+    STATUS_PROCESSING,
+    STATUS_COMPLETED,
+    STATUS_ERROR,
+    MESSAGE_QUEUED,
+    EVENT_FILE,
+    EVENT_COMPLETED,
+    MAX_TRACKED_JOBS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +27,8 @@ class JobStatusManager:
     
     def __init__(self) -> None:
         """Initialize the job status manager."""
-        self._jobs: Dict[str, JobStatus] = {}
+        self._jobs: OrderedDict[str, JobStatus] = OrderedDict()
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
     
     def create_job(self, filenames: list[str]) -> str:
         """
@@ -27,12 +40,14 @@ class JobStatusManager:
         Returns:
             Job ID string
         """
-        job_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}"
+        # Nanosecond timestamp plus random suffix: sortable and collision-free
+        now_ns = time.time_ns()
+        job_id = f"job_{now_ns:x}{secrets.token_hex(4)}"
         
         job_status = JobStatus(
             job_id=job_id,
             total_files=len(filenames),
-            started_at=datetime.now().isoformat(),
+            started_at=datetime.fromtimestamp(now_ns / 1e9).isoformat(),
             status=STATUS_PROCESSING,
             files=[
                 FileStatus(
@@ -45,7 +60,12 @@ class JobStatusManager:
         )
         
         self._jobs[job_id] = job_status
-        logger.info(f"Created job {job_id} with {len(filenames)} files")
+        logger.info("Created job %s with %d files", job_id, len(filenames))
+        
+        # Evict the oldest jobs to keep memory bounded
+        while len(self._jobs) > MAX_TRACKED_JOBS:
+            evicted_job_id, _ = self._jobs.popitem(last=False)
+            logger.info("Evicted job %s", evicted_job_id)
         return job_id
     
     def get_job(self, job_id: str) -> Optional[JobStatus]:
@@ -60,34 +80,84 @@ class JobStatusManager:
         """
         return self._jobs.get(job_id)
     
-    def update_file_status(
-        self,
-        job_id: str,
-        file_index: int,
-        status: str,
-        message: str,
-        result: Optional[FileProcessingResult] = None
-    ) -> None:
+    def get_file_slot(self, job_id: str, file_index: int) -> Optional[FileStatus]:
         """
-        Update status of a file in a job.
+        Get the status entry of a file in a job.
+        
+        Callers processing a file can keep the returned reference and update
+        it directly instead of looking the job up on every change.
         
         Args:
             job_id: Job identifier
             file_index: Index of file in job
-            status: New status
-            message: Status message
-            result: Optional processing result
+            
+        Returns:
+            FileStatus object or None if job or file not found
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not 0 <= file_index < len(job.files):
+            return None
+        return job.files[file_index]
+    
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """
+        Subscribe to status events of a job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Queue receiving (event type, data) tuples; pass it to unsubscribe() when done
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        return queue
+    
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """
+        Stop delivering status events of a job to a queue.
+        
+        Args:
+            job_id: Job identifier
+            queue: Queue returned by subscribe()
         """
-        if job_id not in self._jobs:
-            logger.warning(f"Attempted to update file status for unknown job: {job_id}")
+        queues = self._subscribers.get(job_id)
+        if queues is None:
             return
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            del self._subscribers[job_id]
+    
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        """
+        Deliver a status event to every subscriber of a job.
         
-        job = self._jobs[job_id]
-        if 0 <= file_index < len(job.files):
-            job.files[file_index].status = status
-            job.files[file_index].message = message
-            if result:
-                job.files[file_index].result = result
+        Args:
+            job_id: Job identifier
+            event: Event type (EVENT_FILE or EVENT_COMPLETED)
+            data: Event payload
+        """
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait((event, data))
+    
+    def publish_file_status(self, job: JobStatus, file_index: int) -> None:
+        """
+        Publish the current status of a file in a job.
+        
+        Args:
+            job: Job the file belongs to
+            file_index: Index of file in job
+        """
+        if job.job_id not in self._subscribers:
+            return
+        file_status = job.files[file_index]
+        self.publish(job.job_id, EVENT_FILE, {
+            "file_index": file_index,
+            "status": file_status.status,
+            "message": file_status.message,
+            "version": job.version
+        })
     
     def complete_job(self, job_id: str) -> None:
         """
@@ -99,7 +169,34 @@ class JobStatusManager:
         if job_id in self._jobs:
             self._jobs[job_id].status = STATUS_COMPLETED
             self._jobs[job_id].completed_at = datetime.now().isoformat()
-            logger.info(f"Job {job_id} completed")
+            self._jobs[job_id].version += 1
+            self.publish(job_id, EVENT_COMPLETED, {"version": self._jobs[job_id].version})
+            logger.info("Job %s completed", job_id)
+    
+    def purge_completed_jobs(self, max_age_seconds: float) -> int:
+        """
+        Delete jobs that completed more than max_age_seconds ago.
+        
+        Args:
+            max_age_seconds: Age after which a completed job is deleted
+            
+        Returns:
+            Number of deleted jobs
+        """
+        now = datetime.now()
+        expired_job_ids = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.completed_at is not None
+            and (now - datetime.fromisoformat(job.completed_at)).total_seconds() > max_age_seconds
+        ]
+        
+        for job_id in expired_job_ids:
+            del self._jobs[job_id]
+        
+        if expired_job_ids:
+            logger.info("Purged %d completed jobs", len(expired_job_ids))
+        return len(expired_job_ids)
     
     def delete_job(self, job_id: str) -> None:
         """
@@ -110,7 +207,7 @@ class JobStatusManager:
         """
         if job_id in self._jobs:
             del self._jobs[job_id]
-            logger.info(f"Deleted job {job_id}")
+            logger.info("Deleted job %s", job_id)
 
 
 # Global job status manager instance
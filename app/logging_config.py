@@ -4,6 +4,8 @@ import logging.handlers
 from pathlib import Path
 from typing import Optional
 
+from app.config import config as app_config
+
 
 class LoggingConfig:
     """Configures application logging."""
@@ -24,13 +26,23 @@ class LoggingConfig:
         self.log_file = self.log_dir / "app.log"
         self.error_log_file = self.log_dir / "error.log"
     
-    def setup_logging(self, level: int = logging.INFO) -> None:
+    def setup_logging(
+        self,
+        level: int = logging.INFO,
+        console_level: int = logging.WARNING
+    ) -> None:
         """
         Setup application-wide logging configuration.
         
         Args:
             level: Logging level (default: INFO)
+            console_level: Minimum level written to the console (default: WARNING)
         """
+        # Skip process and thread lookups that the formatters never use
+        logging.logProcesses = False
+        logging.logThreads = False
+        logging.logMultiprocessing = False
+        
         # Create root logger
         root_logger = logging.getLogger()
         root_logger.setLevel(level)
@@ -38,9 +50,13 @@ class LoggingConfig:
         # Remove existing handlers to avoid duplicates
         root_logger.handlers = []
         
-        # Create formatters
-        detailed_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+        # Create formatters; caller location is only included when debugging
+        if level <= logging.DEBUG:
+            file_format = '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+        else:
+            file_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        file_formatter = logging.Formatter(
+            file_format,
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
@@ -49,9 +65,9 @@ class LoggingConfig:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
-        # Console handler (INFO and above)
+        # Console handler (WARNING and above by default)
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        console_handler.setLevel(console_level)
         console_handler.setFormatter(simple_formatter)
         root_logger.addHandler(console_handler)
         
@@ -64,7 +80,7 @@ class LoggingConfig:
             encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
+        file_handler.setFormatter(file_formatter)
         file_handler.suffix = '%Y-%m-%d'
         root_logger.addHandler(file_handler)
         
@@ -77,7 +93,7 @@ class LoggingConfig:
             encoding='utf-8'
         )
         error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(detailed_formatter)
+        error_handler.setFormatter(file_formatter)
         error_handler.suffix = '%Y-%m-%d'
         root_logger.addHandler(error_handler)
         
@@ -93,14 +109,23 @@ class LoggingConfig:
         logger.info(f"Logging initialized. Log files: {self.log_dir}")
 
 
-def setup_app_logging(log_dir: Optional[Path] = None, level: int = logging.INFO) -> None:
+def setup_app_logging(
+    log_dir: Optional[Path] = None,
+    level: int = logging.INFO,
+    console_level: Optional[int] = None
+) -> None:
     """
     Setup application logging (convenience function).
     
     Args:
         log_dir: Directory for log files. Defaults to 'logs' directory.
         level: Logging level (default: INFO)
+        console_level: Minimum level written to the console. Defaults to
+            INFO when DEBUG is enabled, WARNING otherwise.
     """
+    if console_level is None:
+        console_level = logging.INFO if app_config.debug else logging.WARNING
+    
     config = LoggingConfig(log_dir)
-    config.setup_logging(level)
+    config.setup_logging(level, console_level)
 
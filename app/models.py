@@ -1,18 +1,18 @@
 """Data models for the Document Intelligence application."""
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
 from datetime import datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FieldData:
-    """Represents a single extracted field."""
+    """Represents a single extracted field (immutable, so instances can be shared)."""
     field_name: str
     field_value: str
     confidence: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FileProcessingResult:
     """Result of processing a single file."""
     filename: str
@@ -21,7 +21,7 @@ class FileProcessingResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FileStatus:
     """Status of a file being processed."""
     filename: str
@@ -30,7 +30,7 @@ class FileStatus:
     result: Optional[FileProcessingResult] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class JobStatus:
     """Status of a document processing job."""
     job_id: str
@@ -39,38 +39,5 @@ class JobStatus:
     status: str  # "processing" or "completed"
     files: List[FileStatus] = field(default_factory=list)
     completed_at: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "job_id": self.job_id,
-            "total_files": self.total_files,
-            "started_at": self.started_at,
-            "status": self.status,
-            "files": [
-                {
-                    "filename": f.filename,
-                    "status": f.status,
-                    "message": f.message,
-                    "result": (
-                        {
-                            "filename": f.result.filename,
-                            "status": f.result.status,
-                            "fields": [
-                                {
-                                    "field_name": field.field_name,
-                                    "field_value": field.field_value,
-                                    "confidence": field.confidence
-                                }
-                                for field in f.result.fields
-                            ],
-                            "error": f.result.error
-                        }
-                        if f.result else None
-                    )
-                }
-                for f in self.files
-            ],
-            "completed_at": self.completed_at
-        }
+    version: int = 0  # Incremented on every change, used as the status ETag
 
@@ -0,0 +1,98 @@
+"""Cache of extracted fields keyed by document content."""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional, Tuple
+
+from app.models import FieldData
+from app.constants import (
+    UPLOAD_CHUNK_SIZE,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_TTL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultCache:
+    """In-memory LRU cache of extracted fields, so repeat uploads skip Azure."""
+    
+    def __init__(
+        self,
+        max_size: int = RESULT_CACHE_SIZE,
+        ttl_seconds: float = RESULT_CACHE_TTL_SECONDS
+    ) -> None:
+        """
+        Initialize the result cache.
+        
+        Args:
+            max_size: Maximum number of cached documents
+            ttl_seconds: Seconds after which a cached entry is discarded
+        """
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, Tuple[float, Tuple[FieldData, ...]]] = OrderedDict()
+    
+    @staticmethod
+    def compute_key(file_stream: BinaryIO, model_id: str) -> str:
+        """
+        Compute the cache key of a document.
+        
+        Reads the whole stream, so call it from a worker thread for large
+        files. The stream is rewound afterwards.
+        
+        Args:
+            file_stream: Readable, seekable document stream
+            model_id: Azure Document Intelligence model ID
+            
+        Returns:
+            Cache key combining the model ID and a content digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: file_stream.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        file_stream.seek(0)
+        return f"{model_id}:{digest.hexdigest()}"
+    
+    def get(self, key: str) -> Optional[List[FieldData]]:
+        """
+        Get the cached fields of a document.
+        
+        Args:
+            key: Cache key from compute_key()
+            
+        Returns:
+            List of FieldData objects or None if not cached or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, fields = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return list(fields)
+    
+    def put(self, key: str, fields: List[FieldData]) -> None:
+        """
+        Cache the extracted fields of a document.
+        
+        Args:
+            key: Cache key from compute_key()
+            fields: Extracted fields
+        """
+        self._entries[key] = (time.monotonic(), tuple(fields))
+        self._entries.move_to_end(key)
+        
+        # Evict the least recently used entries to keep memory bounded
+        while len(self._entries) > self._max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.debug("Evicted cached result %s", evicted_key)
+
+
+# Global result cache instance
+result_cache = AnalysisResultCache()
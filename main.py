@@ -6,30 +6,87 @@ Document Intelligence service.
 """
 import asyncio
 import logging
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+
+from fastapi import FastAPI, File, Header, UploadFile, HTTPException
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
 
+from app.azure_client import AzureClientFactory
 from app.config import config
 from app.document_processor import DocumentProcessor
 from app.job_manager import job_manager
 from app.models import JobStatus
-from app.constants import ALLOWED_FILE_EXTENSIONS, API_PREFIX
+from app.constants import (
+    ALLOWED_FILE_EXTENSIONS,
+    API_PREFIX,
+    COMPLETED_JOB_TTL_SECONDS,
+    EVENT_COMPLETED,
+    EVENT_SNAPSHOT,
+    GZIP_MINIMUM_SIZE,
+    JOB_CLEANUP_INTERVAL_SECONDS,
+    SSE_KEEPALIVE_SECONDS,
+    STATUS_COMPLETED,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_SPOOL_MAX_SIZE
+)
 from app.logging_config import setup_app_logging
 
 # Setup logging with daily rotation
 setup_app_logging()
 logger = logging.getLogger(__name__)
 
+
+async def cleanup_completed_jobs() -> None:
+    """Periodically purge completed jobs so they don't accumulate in memory."""
+    while True:
+        await asyncio.sleep(JOB_CLEANUP_INTERVAL_SECONDS)
+        job_manager.purge_completed_jobs(COMPLETED_JOB_TTL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Validate configuration and start job cleanup on startup; stop cleanup
+    and release shared clients on shutdown.
+    
+    Args:
+        app: FastAPI application instance
+    """
+    is_valid, error_message = config.validate_azure_credentials()
+    if not is_valid:
+        logger.warning(error_message)
+    
+    cleanup_task = asyncio.create_task(cleanup_completed_jobs())
+    
+    yield
+    
+    cleanup_task.cancel()
+    try:
+        await cleanup_task
+    except asyncio.CancelledError:
+        pass
+    
+    await AzureClientFactory.close_async_client()
+    logger.info("Closed Azure Document Intelligence client")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Document Intelligence Demo",
     version="1.0.0",
-    description="Azure Document Intelligence API for extracting structured data from PDF documents"
+    description="Azure Document Intelligence API for extracting structured data from PDF documents",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -41,13 +98,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses such as status and results payloads
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Allowed upload suffixes, as a tuple for a single str.endswith() call
+_ALLOWED_SUFFIXES = tuple(ext.lower() for ext in ALLOWED_FILE_EXTENSIONS)
+
 # Mount static files
 static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
-@app.get("/", response_class=HTMLResponse)
+def load_index_html() -> Optional[bytes]:
+    """
+    Read the main HTML page from the static directory.
+    
+    Returns:
+        Contents of index.html, or None if it does not exist
+    """
+    html_path = static_dir / "index.html"
+    if html_path.exists():
+        return html_path.read_bytes()
+    return None
+
+
+# index.html is read once; in debug mode it is re-read on every request
+_INDEX_HTML = load_index_html()
+
+
+def spool_upload(file: UploadFile) -> Tuple[BinaryIO, int]:
+    """
+    Copy an uploaded file into a spooled temporary file.
+    
+    Uploads up to UPLOAD_SPOOL_MAX_SIZE stay in memory; larger ones spill
+    to disk. Blocking, so call it from a worker thread.
+    
+    Args:
+        file: Uploaded file
+        
+    Returns:
+        Tuple of (spooled file positioned at the start, size in bytes)
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    file.file.seek(0)
+    shutil.copyfileobj(file.file, spool, UPLOAD_CHUNK_SIZE)
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size
+
+
+@app.get("/", response_class=HTMLResponse, include_in_schema=False)
 async def root() -> HTMLResponse:
     """
     Serve the main HTML page.
@@ -55,10 +156,9 @@ async def root() -> HTMLResponse:
     Returns:
         HTMLResponse: The index.html page content
     """
-    html_path = Path(__file__).parent / "static" / "index.html"
-    if html_path.exists():
-        logger.debug("Serving index.html")
-        return html_path.read_text(encoding="utf-8")
+    index_html = load_index_html() if config.debug else _INDEX_HTML
+    if index_html is not None:
+        return HTMLResponse(content=index_html)
     logger.warning("index.html not found")
     return HTMLResponse(
         content="<h1>Document Intelligence Demo</h1><p>Please create static/index.html</p>",
@@ -67,7 +167,7 @@ async def root() -> HTMLResponse:
 
 
 @app.post(f"{API_PREFIX}/analyze")
-async def analyze_documents(files: List[UploadFile] = File(...)) -> JSONResponse:
+async def analyze_documents(files: List[UploadFile] = File(...)) -> ORJSONResponse:
     """
     Start async document analysis and return job ID for tracking.
     
@@ -75,12 +175,12 @@ async def analyze_documents(files: List[UploadFile] = File(...)) -> JSONResponse
         files: List of uploaded PDF files
         
     Returns:
-        JSONResponse: Contains job_id and total_files for tracking progress
+        ORJSONResponse: Contains job_id and total_files for tracking progress
         
     Raises:
         HTTPException: If no files provided or invalid file types
     """
-    logger.info(f"Received request to analyze {len(files)} files")
+    logger.info("Received request to analyze %d files", len(files))
     
     if not files:
         logger.warning("No files provided in request")
@@ -93,11 +193,11 @@ async def analyze_documents(files: List[UploadFile] = File(...)) -> JSONResponse
     invalid_files = [
         file.filename
         for file in files
-        if not any(file.filename.lower().endswith(ext) for ext in ALLOWED_FILE_EXTENSIONS)
+        if not file.filename.lower().endswith(_ALLOWED_SUFFIXES)
     ]
     
     if invalid_files:
-        logger.warning(f"Invalid file types received: {invalid_files}")
+        logger.warning("Invalid file types received: %s", invalid_files)
         raise HTTPException(
             status_code=400,
             detail=(
@@ -106,30 +206,41 @@ async def analyze_documents(files: List[UploadFile] = File(...)) -> JSONResponse
             )
         )
     
-    # Create job
-    filenames = [file.filename for file in files]
-    job_id = job_manager.create_job(filenames)
-    logger.info(f"Created job {job_id} for {len(filenames)} files: {filenames}")
+    # Spool uploads concurrently; the processor closes each one once it is processed
+    spooled = await asyncio.gather(
+        *(run_in_threadpool(spool_upload, file) for file in files),
+        return_exceptions=True
+    )
+    errors = [outcome for outcome in spooled if isinstance(outcome, BaseException)]
+    if errors:
+        for outcome in spooled:
+            if not isinstance(outcome, BaseException):
+                outcome[0].close()
+        raise errors[0]
     
-    # Read all files content
-    files_content = []
+    files_content: List[Tuple[BinaryIO, str]] = []
     total_size = 0
-    for file in files:
-        content = await file.read()
-        files_content.append((content, file.filename))
-        total_size += len(content)
-        logger.debug(f"Read file {file.filename}: {len(content)} bytes")
+    for file, (file_stream, size) in zip(files, spooled):
+        files_content.append((file_stream, file.filename))
+        total_size += size
+        logger.debug("Spooled file %s: %d bytes", file.filename, size)
+    
+    logger.info("Total upload size: %d bytes (%.2f MB)", total_size, total_size / 1024 / 1024)
     
-    logger.info(f"Total upload size: {total_size} bytes ({total_size / 1024 / 1024:.2f} MB)")
+    # Create the job only once every upload is spooled, so a failed upload
+    # leaves no job stuck in processing
+    filenames = [file.filename for file in files]
+    job_id = job_manager.create_job(filenames)
+    logger.info("Created job %s for %d files: %s", job_id, len(filenames), filenames)
     
     # Start processing asynchronously
     asyncio.create_task(
         DocumentProcessor.process_documents(files_content, job_id)
     )
     
-    logger.info(f"Started async processing for job {job_id}")
+    logger.info("Started async processing for job %s", job_id)
     
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "job_id": job_id,
             "total_files": len(files)
@@ -137,58 +248,172 @@ async def analyze_documents(files: List[UploadFile] = File(...)) -> JSONResponse
     )
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    
+    Uses weak comparison: the header may list several tags, each with an
+    optional W/ prefix, or be "*" to match any current representation.
+    
+    Args:
+        if_none_match: Value of the If-None-Match header, if sent
+        etag: Current ETag of the resource, weak or strong
+        
+    Returns:
+        True if the client's copy is still current
+    """
+    if not if_none_match:
+        return False
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
 @app.get(f"{API_PREFIX}/status/{{job_id}}")
-async def get_status(job_id: str) -> JSONResponse:
+async def get_status(
+    job_id: str,
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
     """
     Get processing status for a job.
     
+    The response carries the job version as a weak ETag (the body may be
+    gzipped or not), so polling clients sending If-None-Match get an empty
+    304 while nothing has changed.
+    
+    Args:
+        job_id: Job identifier
+        if_none_match: ETag of the status the client already has
+        
+    Returns:
+        ORJSONResponse: Current job status, or an empty 304 response if unchanged
+        
+    Raises:
+        HTTPException: If job not found
+    """
+    logger.debug("Status request for job %s", job_id)
+    job = job_manager.get_job(job_id)
+    if not job:
+        logger.warning("Job %s not found", job_id)
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found"
+        )
+    
+    etag = f'W/"{job.version}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # orjson serializes the dataclass tree natively
+    return ORJSONResponse(content=job, headers={"ETag": etag})
+
+
+def format_event(event: str, data: object) -> bytes:
+    """
+    Format a server-sent event.
+    
+    Args:
+        event: Event type
+        data: Event payload, serialized with orjson
+        
+    Returns:
+        Encoded event, ready to be written to the stream
+    """
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.get(f"{API_PREFIX}/events/{{job_id}}")
+async def stream_events(job_id: str) -> StreamingResponse:
+    """
+    Stream status updates of a job as server-sent events.
+    
+    The stream starts with a "snapshot" event holding the full job status,
+    followed by a "file" event for each file status change. It ends with a
+    "completed" event once the job is done.
+    
     Args:
         job_id: Job identifier
         
     Returns:
-        JSONResponse: Current job status
+        StreamingResponse: text/event-stream of job status events
         
     Raises:
         HTTPException: If job not found
     """
-    logger.debug(f"Status request for job {job_id}")
     job = job_manager.get_job(job_id)
     if not job:
-        logger.warning(f"Job {job_id} not found")
+        logger.warning("Job %s not found", job_id)
         raise HTTPException(
             status_code=404,
             detail="Job not found"
         )
     
-    return JSONResponse(content=job.to_dict())
+    async def event_stream() -> AsyncIterator[bytes]:
+        # Subscribe before taking the snapshot so no update is missed
+        queue = job_manager.subscribe(job_id)
+        try:
+            yield format_event(EVENT_SNAPSHOT, job)
+            if job.status == STATUS_COMPLETED:
+                yield format_event(EVENT_COMPLETED, {"version": job.version})
+                return
+            
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Stop if the job was deleted, otherwise keep the connection alive
+                    if job_manager.get_job(job_id) is None:
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+                
+                yield format_event(event, data)
+                if event == EVENT_COMPLETED:
+                    return
+        finally:
+            job_manager.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Content-Encoding keeps GZipMiddleware from buffering the stream
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+    )
 
 
 @app.get(f"{API_PREFIX}/results/{{job_id}}")
-async def get_results(job_id: str) -> JSONResponse:
+async def get_results(job_id: str, consume: bool = False) -> ORJSONResponse:
     """
     Get final results for a completed job.
     
     Args:
         job_id: Job identifier
+        consume: Delete the job once its results have been returned
         
     Returns:
-        JSONResponse: Processing results or status message
+        ORJSONResponse: Processing results or status message
         
     Raises:
         HTTPException: If job not found
     """
-    logger.debug(f"Results request for job {job_id}")
+    logger.debug("Results request for job %s", job_id)
     job = job_manager.get_job(job_id)
     if not job:
-        logger.warning(f"Job {job_id} not found")
+        logger.warning("Job %s not found", job_id)
         raise HTTPException(
             status_code=404,
             detail="Job not found"
         )
     
-    if job.status != "completed":
-        logger.debug(f"Job {job_id} still processing")
-        return JSONResponse(
+    if job.status != STATUS_COMPLETED:
+        logger.debug("Job %s still processing", job_id)
+        return ORJSONResponse(
             content={
                 "status": "processing",
                 "message": "Job is still processing"
@@ -196,28 +421,13 @@ async def get_results(job_id: str) -> JSONResponse:
             status_code=202
         )
     
-    # Collect all results
-    results = []
-    for file_status in job.files:
-        if file_status.result:
-            result_dict = {
-                "filename": file_status.result.filename,
-                "status": file_status.result.status,
-                "fields": [
-                    {
-                        "field_name": field.field_name,
-                        "field_value": field.field_value,
-                        "confidence": field.confidence
-                    }
-                    for field in file_status.result.fields
-                ]
-            }
-            if file_status.result.error:
-                result_dict["error"] = file_status.result.error
-            results.append(result_dict)
-    
-    logger.info(f"Returning results for job {job_id}: {len(results)} files processed")
-    return JSONResponse(content={"results": results})
+    # Collect all results; orjson serializes the dataclasses natively
+    results = [file_status.result for file_status in job.files if file_status.result]
+    
+    logger.info("Returning results for job %s: %d files processed", job_id, len(results))
+    if consume:
+        job_manager.delete_job(job_id)
+    return ORJSONResponse(content={"results": results})
 
 
 @app.get(f"{API_PREFIX}/health")
@@ -226,9 +436,12 @@ async def health_check() -> dict:
     Health check endpoint.
     
     Returns:
-        dict: Health status
+        dict: Health status and usage of the shared Azure call limit
     """
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "azure_calls": DocumentProcessor.get_azure_call_stats()
+    }
 
 
 if __name__ == "__main__":
@@ -183,8 +183,8 @@ document.addEventListener('DOMContentLoaded', () => {
             const data = await response.json();
             const jobId = data.job_id;
             
-            // Poll for status updates
-            await pollJobStatus(jobId);
+            // Follow status updates until the job completes
+            await watchJobStatus(jobId);
             
         } catch (error) {
             console.error('Error:', error);
@@ -208,6 +208,50 @@ document.addEventListener('DOMContentLoaded', () => {
         overlay.style.display = 'flex';
     }
 
+    function watchJobStatus(jobId) {
+        // Fall back to polling where server-sent events are unavailable
+        if (!window.EventSource) {
+            return pollJobStatus(jobId);
+        }
+        
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`/api/events/${jobId}`);
+            let status = null;
+            
+            source.addEventListener('snapshot', event => {
+                status = JSON.parse(event.data);
+                updateProgress(status);
+            });
+            
+            source.addEventListener('file', event => {
+                if (!status) return;
+                const update = JSON.parse(event.data);
+                const file = status.files[update.file_index];
+                file.status = update.status;
+                file.message = update.message;
+                updateProgress(status);
+            });
+            
+            source.addEventListener('completed', () => {
+                source.close();
+                showResults(jobId).then(resolve, reject);
+            });
+            
+            source.onerror = () => {
+                // Stream failed or dropped before completion: switch to polling
+                source.close();
+                pollJobStatus(jobId).then(resolve, reject);
+            };
+        });
+    }
+
+    async function showResults(jobId) {
+        const resultsResponse = await fetch(`/api/results/${jobId}`);
+        const results = await resultsResponse.json();
+        displayResults(results.results);
+        loadingOverlay.style.display = 'none';
+    }
+
     async function pollJobStatus(jobId) {
         const maxAttempts = 300; // 5 minutes max
         const pollInterval = 1000; // 1 second
@@ -222,10 +266,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 
                 if (status.status === 'completed') {
                     // Fetch final results
-                    const resultsResponse = await fetch(`/api/results/${jobId}`);
-                    const results = await resultsResponse.json();
-                    displayResults(results.results);
-                    loadingOverlay.style.display = 'none';
+                    await showResults(jobId);
                     return;
                 }
                 
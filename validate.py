@@ -4,29 +4,81 @@ Validation script to check all project files for errors.
 This script validates Python, HTML, and JavaScript files for syntax errors
 and basic structural issues.
 """
-import ast
+import importlib.util
+import py_compile
+import re
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, List
+from typing import Callable, Dict, Tuple, List
+
+# Brackets, plus the comments and string literals whose contents are skipped
+_JS_TOKEN_PATTERN = re.compile(
+    r"""
+    //[^\n]*                  # line comment
+    | /\*.*?\*/               # block comment
+    | "(?:\\.|[^"\\\n])*"     # double-quoted string
+    | '(?:\\.|[^'\\\n])*'     # single-quoted string
+    | `(?:\\.|[^`\\])*`       # template literal
+    | [{}()]                  # bracket
+    """,
+    re.DOTALL | re.VERBOSE
+)
+
+
+def has_fresh_bytecode(file_path: Path) -> bool:
+    """
+    Check whether a Python file has a cached .pyc matching its current source.
+    
+    Uses the same check as the import system: the .pyc header must carry
+    the interpreter's magic number and the source's mtime and size.
+    
+    Args:
+        file_path: Path to the Python file
+        
+    Returns:
+        True if the cached bytecode is up to date
+    """
+    cache_path = Path(importlib.util.cache_from_source(str(file_path)))
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(16)
+        source_stat = file_path.stat()
+    except OSError:
+        return False
+    
+    return (
+        len(header) == 16
+        and header[:4] == importlib.util.MAGIC_NUMBER
+        and int.from_bytes(header[4:8], 'little') == 0
+        and int.from_bytes(header[8:12], 'little') == int(source_stat.st_mtime) & 0xFFFFFFFF
+        and int.from_bytes(header[12:16], 'little') == source_stat.st_size & 0xFFFFFFFF
+    )
 
 
 def validate_python_file(file_path: Path) -> Tuple[bool, str]:
     """
     Validate a Python file for syntax errors.
     
+    Files whose cached bytecode is up to date are known to compile and are
+    skipped; others are compiled, which also refreshes the cache.
+    
     Args:
         file_path: Path to the Python file
         
     Returns:
         Tuple of (is_valid, error_message)
     """
+    if has_fresh_bytecode(file_path):
+        return True, ""
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source = f.read()
-        ast.parse(source)
+        py_compile.compile(str(file_path), doraise=True)
         return True, ""
-    except SyntaxError as e:
-        return False, f"Syntax error at line {e.lineno}: {e.msg}"
+    except py_compile.PyCompileError as e:
+        if isinstance(e.exc_value, SyntaxError):
+            return False, f"Syntax error at line {e.exc_value.lineno}: {e.exc_value.msg}"
+        return False, f"Error: {e.msg}"
     except Exception as e:
         return False, f"Error: {str(e)}"
 
@@ -72,17 +124,23 @@ def validate_javascript_file(file_path: Path) -> Tuple[bool, str]:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Basic checks
-        open_braces = content.count('{')
-        close_braces = content.count('}')
+        # Count brackets in a single pass, ignoring comments and strings
+        counts = {'{': 0, '}': 0, '(': 0, ')': 0}
+        for match in _JS_TOKEN_PATTERN.finditer(content):
+            token = match.group()
+            if token in counts:
+                counts[token] += 1
+        
+        open_braces = counts['{']
+        close_braces = counts['}']
         if open_braces != close_braces:
             return False, (
                 f"Mismatched braces: {open_braces} opening, "
                 f"{close_braces} closing"
             )
         
-        open_parens = content.count('(')
-        close_parens = content.count(')')
+        open_parens = counts['(']
+        close_parens = counts[')']
         if open_parens != close_parens:
             return False, (
                 f"Mismatched parentheses: {open_parens} opening, "
@@ -94,6 +152,29 @@ def validate_javascript_file(file_path: Path) -> Tuple[bool, str]:
         return False, f"Error reading file: {str(e)}"
 
 
+def submit_validations(
+    executor: ThreadPoolExecutor,
+    validator: Callable[[Path], Tuple[bool, str]],
+    files: List[Path]
+) -> Dict[Path, Future]:
+    """
+    Start validating the existing files among the given ones.
+    
+    Args:
+        executor: Executor running the validations
+        validator: Validation function for the file type
+        files: Files to validate
+        
+    Returns:
+        Mapping of each existing file to the future of its validation result
+    """
+    return {
+        file_path: executor.submit(validator, file_path)
+        for file_path in files
+        if file_path.exists()
+    }
+
+
 def main() -> int:
     """
     Main validation function.
@@ -128,12 +209,30 @@ def main() -> int:
             app_dir / "field_extractor.py",
             app_dir / "job_manager.py",
             app_dir / "document_processor.py",
+            app_dir / "logging_config.py",
+            app_dir / "result_cache.py",
         ])
     
+    # Validate HTML files
+    html_files = [
+        project_root / "static" / "index.html",
+    ]
+    
+    # Validate JavaScript files
+    js_files = [
+        project_root / "static" / "script.js",
+    ]
+    
+    # Files are independent, so validate them all in parallel up front
+    with ThreadPoolExecutor() as executor:
+        python_results = submit_validations(executor, validate_python_file, python_files)
+        html_results = submit_validations(executor, validate_html_file, html_files)
+        js_results = submit_validations(executor, validate_javascript_file, js_files)
+    
     print("Validating Python files...")
     for py_file in python_files:
-        if py_file.exists():
-            is_valid, error_msg = validate_python_file(py_file)
+        if py_file in python_results:
+            is_valid, error_msg = python_results[py_file].result()
             if is_valid:
                 print(f"  [OK] {py_file.relative_to(project_root)}")
             else:
@@ -145,15 +244,10 @@ def main() -> int:
     
     print()
     
-    # Validate HTML files
-    html_files = [
-        project_root / "static" / "index.html",
-    ]
-    
     print("Validating HTML files...")
     for html_file in html_files:
-        if html_file.exists():
-            is_valid, error_msg = validate_html_file(html_file)
+        if html_file in html_results:
+            is_valid, error_msg = html_results[html_file].result()
             if is_valid:
                 print(f"  [OK] {html_file.name}")
             else:
@@ -165,15 +259,10 @@ def main() -> int:
     
     print()
     
-    # Validate JavaScript files
-    js_files = [
-        project_root / "static" / "script.js",
-    ]
-    
     print("Validating JavaScript files...")
     for js_file in js_files:
-        if js_file.exists():
-            is_valid, error_msg = validate_javascript_file(js_file)
+        if js_file in js_results:
+            is_valid, error_msg = js_results[js_file].result()
             if is_valid:
                 print(f"  [OK] {js_file.name}")
             else: